@@ -13,16 +13,33 @@
 #   - app.py                                     <- este archivo
 #   - mercado_editorial_latam_2000_2025.csv       <- los datos
 #   - requirements.txt                            <- lista de librerías
+#
+# CACHÉ EN DISCO (opcional, se crea sola):
+#   - .cache_libros/cache.sqlite  <- resultados ya calculados, compartidos entre
+#     todos los procesos de Streamlit de la MISMA máquina (no sirve en una carpeta
+#     de red). Ver la sección "CACHÉ EN DISCO COMPARTIDA".
 # ──────────────────────────────────────────────────────────────────────────────
 
 # ── IMPORTACIONES ─────────────────────────────────────────────────────────────
 # Acá le decimos a Python qué herramientas vamos a usar.
 # Cada "import" trae una librería con funciones ya listas para usar.
 
+import atexit                      # Ejecuta una función cuando el proceso termina
+import hashlib                     # Calcula "huellas" (hashes) para identificar versiones
+import io                          # Lee texto en memoria como si fuera un archivo (tabla en JSON)
+import json                        # Guarda números y textos de la caché en formato JSON
+import math                        # Para detectar valores no numéricos como "nan" o "inf"
+import os                          # Lee variables de entorno y arma rutas de archivos
+import sqlite3                     # Base de datos en un archivo — la usamos como caché en disco
+import threading                   # Un "candado" para compartir la conexión a la caché entre sesiones
+import time                        # Marca de tiempo del último uso de cada entrada de la caché
+
 import streamlit as st             # La librería principal — crea la interfaz web
 import pandas as pd                # Maneja tablas de datos (lee el CSV, filtra, agrupa)
+import plotly                      # Solo para conocer la versión instalada (clave de la caché)
 import plotly.express as px        # Crea gráficos interactivos de forma simple
 import plotly.graph_objects as go  # Para gráficos más avanzados y personalizados
+import plotly.io as pio            # Reconstruye figuras Plotly a partir de su JSON
 
 
 # ── CONFIGURACIÓN DE LA PÁGINA ────────────────────────────────────────────────
@@ -162,17 +179,290 @@ button[data-baseweb="tab"][aria-selected="true"] {
 """, unsafe_allow_html=True)
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# CACHÉ EN DISCO COMPARTIDA
+# ══════════════════════════════════════════════════════════════════════════════
+# @st.cache_data guarda resultados solo en la memoria de UN proceso. Si hay varias
+# copias de la app detrás de un balanceador, cada una vuelve a leer el CSV y a
+# calcular todo, y al reiniciar se pierde. Por eso guardamos también los resultados
+# (datos leídos, agregados y gráficos en JSON) en un archivo SQLite que comparten
+# todos los procesos de la misma máquina: lo que calcula uno, lo aprovechan los demás.
+#
+# - La carpeta se configura con la variable de entorno LIBROS_CACHE_DIR. Tiene que
+#   ser un disco LOCAL de la máquina: SQLite en modo WAL solo coordina procesos de un
+#   mismo equipo y puede corromper la base en NFS u otras carpetas de red. Si las
+#   réplicas corren en máquinas distintas, cada una debe usar su propia carpeta local.
+# - El tamaño máximo (en MB) con LIBROS_CACHE_MAX_MB. Cuando se supera, se borran
+#   primero las entradas que hace más tiempo no se usan (LRU = "least recently used").
+# - Cada clave incluye la versión de los datos, del código y de pandas/plotly, así que
+#   si cambia el CSV, app.py o una librería, las entradas viejas simplemente dejan de
+#   usarse y se van borrando. Una entrada que no se puede leer se borra y se recalcula.
+# - Todo se guarda como JSON (tabla, números y gráficos), nunca con pickle: leer un
+#   JSON no puede ejecutar código aunque alguien modifique el archivo de la caché.
+
+CACHE_MAX_MB_DEFAULT = 256
+
+
+def leer_cache_max_mb():
+    """
+    Lee LIBROS_CACHE_MAX_MB. Si el valor no es un número positivo, avisa en pantalla
+    y usa el valor por defecto: un error en esta variable no debe impedir abrir la app.
+    """
+    texto = os.environ.get("LIBROS_CACHE_MAX_MB", str(CACHE_MAX_MB_DEFAULT))
+    try:
+        max_mb = float(texto)
+    except ValueError:
+        max_mb = 0
+    # float() también acepta "nan" e "inf", que no sirven como tamaño. Miramos el valor
+    # ya pasado a bytes, porque un número enorme también se vuelve infinito ahí.
+    if not math.isfinite(max_mb * 1024 * 1024) or max_mb <= 0:
+        st.warning(f"⚠️ LIBROS_CACHE_MAX_MB={texto!r} no es válido; "
+                   f"se usan {CACHE_MAX_MB_DEFAULT} MB para la caché en disco.")
+        max_mb = CACHE_MAX_MB_DEFAULT
+    return max_mb
+
+
+ARCHIVO_CSV     = "mercado_editorial_latam_2000_2025.csv"
+CACHE_DIR       = os.environ.get("LIBROS_CACHE_DIR", ".cache_libros")
+CACHE_MAX_BYTES = int(leer_cache_max_mb() * 1024 * 1024)
+CACHE_DB        = os.path.join(CACHE_DIR, "cache.sqlite")
+
+# Para no escribir en la base en cada lectura: el "último uso" de una entrada se
+# actualiza como mucho una vez por minuto, y los contadores de aciertos/fallos se
+# acumulan en memoria y se guardan juntos cada 30 segundos (o con la próxima escritura).
+REFRESCO_LRU_SEG       = 60
+VOLCADO_CONTADORES_SEG = 30
+
+
+@st.cache_resource
+def _huella_archivo(ruta, modificado):
+    """Hash corto del contenido de un archivo. `modificado` solo sirve de clave."""
+    with open(ruta, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def huella_archivo(ruta):
+    """
+    Retorna la "versión" de un archivo. Streamlit ejecuta este script en cada
+    interacción, así que el hash se calcula una vez por proceso y solo se repite
+    si cambia la fecha de modificación del archivo.
+    """
+    return _huella_archivo(ruta, os.path.getmtime(ruta))
+
+
+# VERSION_DATOS cambia si cambia el CSV; VERSION_CODIGO si cambia este archivo
+# (por ejemplo, el estilo de un gráfico), para no servir figuras desactualizadas.
+VERSION_DATOS  = huella_archivo(ARCHIVO_CSV)
+VERSION_CODIGO = huella_archivo(__file__)
+
+# Un proceso con otra versión de pandas o plotly puede no entender lo que guardó otro
+# (por ejemplo, durante una actualización gradual de las réplicas).
+VERSION_LIBRERIAS = f"pandas-{pd.__version__}|plotly-{plotly.__version__}"
+
+
+@st.cache_resource
+def _abrir_cache(ruta_db):
+    """
+    Abre UNA conexión a la caché por proceso (st.cache_resource la reutiliza en todas
+    las sesiones) y crea las tablas. Retorna None si la caché no está disponible.
+    """
+    try:
+        os.makedirs(os.path.dirname(ruta_db) or ".", exist_ok=True)
+        # isolation_level=None: las lecturas no abren transacciones; las escrituras las
+        # abrimos a mano en _escribir(). timeout corto: si otro proceso está escribiendo,
+        # preferimos saltear la escritura antes que demorar la página.
+        con = sqlite3.connect(ruta_db, timeout=2, isolation_level=None, check_same_thread=False)
+        # WAL permite que varios procesos lean mientras otro escribe.
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS entradas ("
+            " clave TEXT PRIMARY KEY, valor BLOB NOT NULL,"
+            " tamano INTEGER NOT NULL, ultimo_uso REAL NOT NULL)"
+        )
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS contadores ("
+            " nombre TEXT PRIMARY KEY, valor INTEGER NOT NULL)"
+        )
+    except (sqlite3.Error, OSError):
+        return None
+    cache = {
+        "con": con,
+        "candado": threading.Lock(),       # una sola sesión por vez usa la conexión
+        "pendientes": {"aciertos": 0, "fallos": 0},
+        "volcado": time.time(),            # última vez que se guardaron los contadores
+    }
+    # Al cerrar el proceso guardamos los contadores que quedaron en memoria.
+    atexit.register(_volcar_contadores, cache)
+    return cache
+
+
+def _escribir(cache, operaciones):
+    """
+    Ejecuta operaciones(con) en una transacción de escritura y, de paso, guarda los
+    contadores acumulados en memoria. Llamar con el candado tomado.
+    Si la base está ocupada o falla, no hace nada: la caché es opcional.
+    """
+    con = cache["con"]
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            operaciones(con)
+            for nombre, cantidad in cache["pendientes"].items():
+                if cantidad:
+                    con.execute(
+                        "INSERT INTO contadores (nombre, valor) VALUES (?, ?) "
+                        "ON CONFLICT(nombre) DO UPDATE SET valor = valor + excluded.valor",
+                        (nombre, cantidad)
+                    )
+            con.execute("COMMIT")
+        except BaseException:
+            if con.in_transaction:
+                con.execute("ROLLBACK")
+            raise
+    except sqlite3.Error:
+        return
+    cache["pendientes"] = {"aciertos": 0, "fallos": 0}
+    cache["volcado"] = time.time()
+
+
+def _volcar_contadores(cache):
+    """Guarda en la base los contadores acumulados en memoria (sin otra escritura)."""
+    with cache["candado"]:
+        if any(cache["pendientes"].values()):
+            _escribir(cache, lambda con: None)
+
+
+def _guardar_entrada(con, clave, datos):
+    """Guarda una entrada y aplica el desalojo LRU si la caché superó su tamaño máximo."""
+    con.execute(
+        "INSERT OR REPLACE INTO entradas (clave, valor, tamano, ultimo_uso) VALUES (?, ?, ?, ?)",
+        (clave, sqlite3.Binary(datos), len(datos), time.time())
+    )
+    # Desalojo LRU: mientras el total supere el máximo, borramos la entrada
+    # usada hace más tiempo.
+    total = con.execute("SELECT COALESCE(SUM(tamano), 0) FROM entradas").fetchone()[0]
+    if total > CACHE_MAX_BYTES:
+        viejas = con.execute("SELECT clave, tamano FROM entradas ORDER BY ultimo_uso").fetchall()
+        for clave_vieja, tamano in viejas:
+            if total <= CACHE_MAX_BYTES:
+                break
+            con.execute("DELETE FROM entradas WHERE clave = ?", (clave_vieja,))
+            total -= tamano
+
+
+def _json_a_bytes(valor):
+    return json.dumps(valor).encode("utf-8")
+
+
+def _json_desde_bytes(datos):
+    return json.loads(bytes(datos).decode("utf-8"))
+
+
+def cache_disco(clave, construir, a_bytes=_json_a_bytes, desde_bytes=_json_desde_bytes):
+    """
+    Busca `clave` en la caché en disco; si no está, llama a construir() y la guarda.
+    Parámetros:
+        clave       — texto que identifica el resultado (incluir versión y filtros)
+        construir   — función sin argumentos que calcula el resultado
+        a_bytes     — convierte el resultado a bytes para guardarlo (default JSON)
+        desde_bytes — convierte los bytes guardados de vuelta al resultado
+    Si la caché no está disponible (disco lleno, carpeta de solo lectura, etc.)
+    la app sigue funcionando: simplemente calcula el resultado sin guardarlo.
+    """
+    cache = _abrir_cache(CACHE_DB)
+    if cache is None:
+        return construir()
+
+    clave = hashlib.sha256(f"{VERSION_LIBRERIAS}|{clave}".encode("utf-8")).hexdigest()
+    with cache["candado"]:
+        try:
+            filas = cache["con"].execute(
+                "SELECT valor, ultimo_uso FROM entradas WHERE clave = ?", (clave,)
+            ).fetchall()
+        except sqlite3.Error:
+            filas = []
+        if filas:
+            valor, ultimo_uso = filas[0]
+            try:
+                resultado = desde_bytes(valor)
+            except Exception:
+                # Entrada dañada o ilegible: la borramos y la recalculamos más abajo.
+                _escribir(cache, lambda con: con.execute("DELETE FROM entradas WHERE clave = ?", (clave,)))
+            else:
+                # Un acierto es solo una lectura: únicamente escribimos si toca
+                # refrescar el "último uso" o guardar los contadores acumulados.
+                cache["pendientes"]["aciertos"] += 1
+                ahora = time.time()
+                refrescar = ahora - ultimo_uso > REFRESCO_LRU_SEG
+                if refrescar or ahora - cache["volcado"] > VOLCADO_CONTADORES_SEG:
+                    def refrescar_uso(con):
+                        if refrescar:
+                            con.execute("UPDATE entradas SET ultimo_uso = ? WHERE clave = ?", (ahora, clave))
+                    _escribir(cache, refrescar_uso)
+                return resultado
+        cache["pendientes"]["fallos"] += 1
+
+    # Calculamos fuera del candado para no frenar a las otras sesiones mientras tanto.
+    resultado = construir()
+    datos = a_bytes(resultado)
+    with cache["candado"]:
+        _escribir(cache, lambda con: _guardar_entrada(con, clave, datos))
+    return resultado
+
+
+def estadisticas_cache():
+    """Retorna (aciertos, fallos, MB usados) de la caché en disco, o None si no está disponible."""
+    cache = _abrir_cache(CACHE_DB)
+    if cache is None:
+        return None
+    with cache["candado"]:
+        try:
+            contadores = dict(cache["con"].execute("SELECT nombre, valor FROM contadores").fetchall())
+            usados = cache["con"].execute("SELECT COALESCE(SUM(tamano), 0) FROM entradas").fetchall()[0][0]
+        except sqlite3.Error:
+            return None
+        # Sumamos lo que este proceso todavía no guardó en la base.
+        aciertos = contadores.get("aciertos", 0) + cache["pendientes"]["aciertos"]
+        fallos   = contadores.get("fallos", 0) + cache["pendientes"]["fallos"]
+    return aciertos, fallos, usados / (1024 * 1024)
+
+
+def figura_en_cache(nombre, firma, construir):
+    """
+    Igual que cache_disco(), pero para figuras Plotly: las guarda como JSON.
+    Parámetros:
+        nombre    — identificador del gráfico (ej. "fig1a")
+        firma     — texto con todos los filtros/controles de los que depende
+        construir — función sin argumentos que arma la figura
+    """
+    # ¿Conviene? Medido con estos datos: reconstruir la figura desde su JSON cuesta
+    # ~11 ms contra ~60 ms de armar un px.line, y ~55 ms contra ~550-625 ms de los
+    # gráficos animados. Pasarle el JSON crudo a st.plotly_chart no ahorra nada:
+    # Streamlit igual lo convierte en go.Figure y lo valida.
+    return cache_disco(
+        f"figura|{nombre}|{VERSION_DATOS}|{VERSION_CODIGO}|{firma}", construir,
+        a_bytes=lambda fig: fig.to_json().encode("utf-8"),
+        desde_bytes=lambda datos: pio.from_json(bytes(datos).decode("utf-8"))
+    )
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # CARGA DE DATOS
 # ══════════════════════════════════════════════════════════════════════════════
 # @st.cache_data guarda el CSV en memoria después de la primera lectura.
 # Así, cuando el usuario mueve un filtro, no se vuelve a leer el disco — más rápido.
+# Debajo está la caché en disco: un proceso nuevo toma la tabla ya leída por otro.
 
 @st.cache_data
-def load_data():
-    """Lee el CSV y retorna un DataFrame de pandas."""
-    df = pd.read_csv("mercado_editorial_latam_2000_2025.csv")
-    return df
+def load_data(version=VERSION_DATOS):
+    """Lee el CSV (o la copia en la caché en disco) y retorna un DataFrame de pandas."""
+    # orient="split" guarda columnas, índice y valores por separado; al leerlo de
+    # vuelta se obtiene la misma tabla que con read_csv.
+    return cache_disco(
+        f"datos|{version}|{VERSION_CODIGO}", lambda: pd.read_csv(ARCHIVO_CSV),
+        a_bytes=lambda tabla: tabla.to_json(orient="split").encode("utf-8"),
+        desde_bytes=lambda datos: pd.read_json(io.StringIO(bytes(datos).decode("utf-8")), orient="split")
+    )
 
 df = load_data()
 
@@ -234,6 +524,37 @@ def apply_dark_theme(fig, height=420):
     return fig
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# FUNCIÓN: AÑO INICIAL DE UN GRÁFICO ANIMADO
+# ══════════════════════════════════════════════════════════════════════════════
+# Un gráfico con animation_frame abre siempre en el primer cuadro (el año más viejo).
+# Esta función lo hace abrir en el año que elijamos, sin perder la animación.
+
+def empezar_animacion_en(fig, anio):
+    """
+    Hace que un gráfico animado arranque mostrando `anio` en vez del primer cuadro.
+    Parámetros:
+        fig  — figura creada con animation_frame="anio"
+        anio — año inicial (si no hay un cuadro para ese año, se usa el último)
+    """
+    nombres = [cuadro.name for cuadro in fig.frames]
+    indice = nombres.index(str(anio)) if str(anio) in nombres else len(nombres) - 1
+    cuadro = fig.frames[indice]
+
+    # Lo que se ve al cargar son las trazas de la figura: les copiamos los datos del
+    # cuadro elegido (buscando cada país por su nombre). update() solo pisa lo que trae
+    # el cuadro, así se conservan estilos como texttemplate o textposition.
+    trazas_cuadro = {traza.name: traza for traza in cuadro.data}
+    for traza in fig.data:
+        if traza.name in trazas_cuadro:
+            traza.update(trazas_cuadro[traza.name].to_plotly_json())
+    fig.update_layout(cuadro.layout)
+
+    # El slider de años también tiene que marcar ese año.
+    fig.layout.sliders[0].active = indice
+    return fig
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # HEADER
 # ══════════════════════════════════════════════════════════════════════════════
@@ -284,6 +605,10 @@ with st.sidebar:
         "</div>", unsafe_allow_html=True
     )
 
+    # Lugar reservado para los contadores de la caché en disco. Se completa al final
+    # del archivo, cuando ya se calcularon todos los gráficos de esta ejecución.
+    contadores_cache = st.empty()
+
 
 # ── APLICAR FILTROS ───────────────────────────────────────────────────────────
 # Filtramos el DataFrame original con los valores de los controles del sidebar.
@@ -301,6 +626,10 @@ if df_f.empty:
     st.warning("⚠️ Seleccioná al menos un país para ver los datos.")
     st.stop()
 
+# "Firma" de los filtros: junto con la versión de los datos identifica cada resultado
+# en la caché en disco. Ordenamos los países para que el orden de selección no importe.
+firma_filtros = f"{anio_min}-{anio_max}|{','.join(sorted(paises_sel))}"
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # KPI CARDS
@@ -310,12 +639,22 @@ if df_f.empty:
 
 st.markdown("---")
 
-total_ejemplares  = df_f["ejemplares_producidos_millones"].sum()
-total_facturacion = df_f["facturacion_estimada_millones_usd"].sum()
-max_per_capita    = df_f["ejemplares_per_capita"].max()
-total_titulos     = df_f["titulos_registrados_isbn"].sum()
-pais_lider        = df_f.loc[df_f["facturacion_estimada_millones_usd"].idxmax(), "pais"]
-pais_lider_anio   = int(df_f.loc[df_f["facturacion_estimada_millones_usd"].idxmax(), "anio"])
+def calcular_kpis():
+    """Calcula los números de las tarjetas para los filtros actuales."""
+    fila_lider = df_f.loc[df_f["facturacion_estimada_millones_usd"].idxmax()]
+    return (
+        float(df_f["ejemplares_producidos_millones"].sum()),
+        float(df_f["facturacion_estimada_millones_usd"].sum()),
+        float(df_f["ejemplares_per_capita"].max()),
+        int(df_f["titulos_registrados_isbn"].sum()),
+        str(fila_lider["pais"]),
+        int(fila_lider["anio"]),
+    )
+
+(total_ejemplares, total_facturacion, max_per_capita,
+ total_titulos, pais_lider, pais_lider_anio) = cache_disco(
+    f"kpis|{VERSION_DATOS}|{VERSION_CODIGO}|{firma_filtros}", calcular_kpis
+)
 
 c1, c2, c3, c4, c5 = st.columns(5)
 with c1:
@@ -371,34 +710,46 @@ with tab1:
 
     col1, col2 = st.columns(2)
 
+    # Cada gráfico se arma dentro de una función "construir_…". figura_en_cache() la llama
+    # solo si el gráfico no está ya guardado en la caché en disco para estos filtros.
+
     with col1:
         # Gráfico de líneas: evolución de ejemplares producidos por país a lo largo del tiempo.
         # markers=True agrega un puntito en cada año para que sea más fácil leer valores exactos.
-        fig1a = px.line(df_f, x="anio", y="ejemplares_producidos_millones", color="pais",
-                        markers=True, title="Ejemplares producidos (millones)",
-                        labels={"ejemplares_producidos_millones": "Millones", "anio": "Año", "pais": "País"},
-                        color_discrete_map=COLORES_PAISES)
-        fig1a = apply_dark_theme(fig1a)
+        def construir_fig1a():
+            fig1a = px.line(df_f, x="anio", y="ejemplares_producidos_millones", color="pais",
+                            markers=True, title="Ejemplares producidos (millones)",
+                            labels={"ejemplares_producidos_millones": "Millones", "anio": "Año", "pais": "País"},
+                            color_discrete_map=COLORES_PAISES)
+            return apply_dark_theme(fig1a)
+
+        fig1a = figura_en_cache("fig1a", firma_filtros, construir_fig1a)
         st.plotly_chart(fig1a, use_container_width=True)
 
     with col2:
         # Gráfico de líneas: cantidad de títulos nuevos con ISBN registrados por año.
         # ISBN = número internacional que identifica cada libro publicado en el mundo.
-        fig1b = px.line(df_f, x="anio", y="titulos_registrados_isbn", color="pais",
-                        markers=True, title="Títulos ISBN registrados por año",
-                        labels={"titulos_registrados_isbn": "Títulos", "anio": "Año", "pais": "País"},
-                        color_discrete_map=COLORES_PAISES)
-        fig1b = apply_dark_theme(fig1b)
+        def construir_fig1b():
+            fig1b = px.line(df_f, x="anio", y="titulos_registrados_isbn", color="pais",
+                            markers=True, title="Títulos ISBN registrados por año",
+                            labels={"titulos_registrados_isbn": "Títulos", "anio": "Año", "pais": "País"},
+                            color_discrete_map=COLORES_PAISES)
+            return apply_dark_theme(fig1b)
+
+        fig1b = figura_en_cache("fig1b", firma_filtros, construir_fig1b)
         st.plotly_chart(fig1b, use_container_width=True)
 
     # Área apilada: cada franja de color representa un país.
     # Las franjas se acumulan una sobre otra — la altura total = producción regional combinada.
     # Es útil para ver tanto el volumen total como qué porción aporta cada país.
-    fig1c = px.area(df_f, x="anio", y="ejemplares_producidos_millones", color="pais",
-                    title="Participación regional acumulada — Ejemplares (área apilada)",
-                    labels={"ejemplares_producidos_millones": "Millones", "anio": "Año", "pais": "País"},
-                    color_discrete_map=COLORES_PAISES)
-    fig1c = apply_dark_theme(fig1c, height=380)
+    def construir_fig1c():
+        fig1c = px.area(df_f, x="anio", y="ejemplares_producidos_millones", color="pais",
+                        title="Participación regional acumulada — Ejemplares (área apilada)",
+                        labels={"ejemplares_producidos_millones": "Millones", "anio": "Año", "pais": "País"},
+                        color_discrete_map=COLORES_PAISES)
+        return apply_dark_theme(fig1c, height=380)
+
+    fig1c = figura_en_cache("fig1c", firma_filtros, construir_fig1c)
     st.plotly_chart(fig1c, use_container_width=True)
 
 
@@ -421,103 +772,211 @@ with tab2:
     with col3:
         # Barras agrupadas: barmode="group" pone las barras de cada país una al lado de la otra.
         # Es útil para comparar países en el mismo año de un vistazo.
-        fig2a = px.bar(df_f, x="anio", y="facturacion_estimada_millones_usd", color="pais",
-                       barmode="group", title="Facturación estimada (USD millones)",
-                       labels={"facturacion_estimada_millones_usd": "USD M", "anio": "Año", "pais": "País"},
-                       color_discrete_map=COLORES_PAISES)
-        fig2a = apply_dark_theme(fig2a)
+        def construir_fig2a():
+            fig2a = px.bar(df_f, x="anio", y="facturacion_estimada_millones_usd", color="pais",
+                           barmode="group", title="Facturación estimada (USD millones)",
+                           labels={"facturacion_estimada_millones_usd": "USD M", "anio": "Año", "pais": "País"},
+                           color_discrete_map=COLORES_PAISES)
+            return apply_dark_theme(fig2a)
+
+        fig2a = figura_en_cache("fig2a", firma_filtros, construir_fig2a)
         st.plotly_chart(fig2a, use_container_width=True)
 
     with col4:
         # Líneas de per cápita: ajusta por tamaño de población para comparar países de forma justa.
         # Sin este ajuste, México siempre "gana" solo por tener más habitantes.
         # La línea punteada en y=1 es un benchmark: "1 libro producido por habitante por año".
-        fig2b = px.line(df_f, x="anio", y="ejemplares_per_capita", color="pais",
-                        markers=True, title="Ejemplares por habitante (per cápita)",
-                        labels={"ejemplares_per_capita": "Ej./hab.", "anio": "Año", "pais": "País"},
-                        color_discrete_map=COLORES_PAISES)
-        fig2b.add_hline(y=1.0, line_dash="dot", line_color="rgba(255,255,255,0.25)",
-                        annotation_text="1 ej./hab.", annotation_font_color="#888")
-        fig2b = apply_dark_theme(fig2b)
+        def construir_fig2b():
+            fig2b = px.line(df_f, x="anio", y="ejemplares_per_capita", color="pais",
+                            markers=True, title="Ejemplares por habitante (per cápita)",
+                            labels={"ejemplares_per_capita": "Ej./hab.", "anio": "Año", "pais": "País"},
+                            color_discrete_map=COLORES_PAISES)
+            fig2b.add_hline(y=1.0, line_dash="dot", line_color="rgba(255,255,255,0.25)",
+                            annotation_text="1 ej./hab.", annotation_font_color="#888")
+            return apply_dark_theme(fig2b)
+
+        fig2b = figura_en_cache("fig2b", firma_filtros, construir_fig2b)
         st.plotly_chart(fig2b, use_container_width=True)
 
     # Mapa de calor (heatmap): cada celda = un país en un año. El color indica el valor.
     # pivot_table reorganiza los datos de "filas largas" a una tabla cuadrada país×año.
     # aggfunc="mean" promedia si hubiera filas duplicadas (no hay, pero es buena práctica).
-    pivot_fact = df_f.pivot_table(
-        index="pais", columns="anio",
-        values="facturacion_estimada_millones_usd", aggfunc="mean"
-    )
-    fig2c = px.imshow(
-        pivot_fact,
-        title="Mapa de calor — Facturación (USD M) · Dorado = mayor, oscuro = menor",
-        labels=dict(color="USD M", x="Año", y="País"),
-        color_continuous_scale=[[0.0, "#1a1d27"], [0.3, "#2d3a5c"],
-                                 [0.6, "#c17f24"], [1.0, "#f5c842"]],
-        aspect="auto", text_auto=".0f"   # text_auto muestra el número dentro de cada celda
-    )
-    fig2c.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(26,29,39,0.8)",
-        font=dict(family="DM Sans", color="#c0c8d8"),
-        title_font=dict(family="Playfair Display, serif", size=16, color="#f0f0f0"),
-        height=320, margin=dict(t=50, b=30, l=100, r=20),
-        coloraxis_colorbar=dict(tickfont=dict(color="#aaa"),
-                                title=dict(text="USD M", font=dict(color="#aaa")))
-    )
-    fig2c.update_traces(textfont=dict(size=9, color="#fff"))
+    def construir_fig2c():
+        pivot_fact = df_f.pivot_table(
+            index="pais", columns="anio",
+            values="facturacion_estimada_millones_usd", aggfunc="mean"
+        )
+        fig2c = px.imshow(
+            pivot_fact,
+            title="Mapa de calor — Facturación (USD M) · Dorado = mayor, oscuro = menor",
+            labels=dict(color="USD M", x="Año", y="País"),
+            color_continuous_scale=[[0.0, "#1a1d27"], [0.3, "#2d3a5c"],
+                                     [0.6, "#c17f24"], [1.0, "#f5c842"]],
+            aspect="auto", text_auto=".0f"   # text_auto muestra el número dentro de cada celda
+        )
+        fig2c.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(26,29,39,0.8)",
+            font=dict(family="DM Sans", color="#c0c8d8"),
+            title_font=dict(family="Playfair Display, serif", size=16, color="#f0f0f0"),
+            height=320, margin=dict(t=50, b=30, l=100, r=20),
+            coloraxis_colorbar=dict(tickfont=dict(color="#aaa"),
+                                    title=dict(text="USD M", font=dict(color="#aaa")))
+        )
+        fig2c.update_traces(textfont=dict(size=9, color="#fff"))
+        return fig2c
+
+    fig2c = figura_en_cache("fig2c", firma_filtros, construir_fig2c)
     st.plotly_chart(fig2c, use_container_width=True)
 
     st.markdown("---")
     st.subheader("🏆 Comparativa en un año puntual")
     st.markdown(
-        "<div class='insight-box'>💡 Usá el slider para elegir el año y ver cómo cambia "
-        "el ranking entre países. El gráfico de burbujas muestra facturación (eje X), "
+        "<div class='insight-box'>💡 Apretá ▶ o arrastrá el slider de años debajo de los "
+        "gráficos para ver cómo cambia el ranking entre países (o elegí <em>Año fijo</em>). El gráfico de burbujas muestra facturación (eje X), "
         "per cápita (eje Y) y títulos ISBN (tamaño de la burbuja) al mismo tiempo.</div>",
         unsafe_allow_html=True
     )
 
-    # Selector de año independiente del filtro global del sidebar.
-    # select_slider muestra los valores como opciones discretas (cada año disponible).
-    anio_comp = st.select_slider(
-        "📅 Elegí el año para la comparativa",
-        options=sorted(df_f["anio"].unique()),
-        value=min(2024, df_f["anio"].max())
+    # Modo de la comparativa. En "Animado" se calculan TODOS los años de una sola vez
+    # como cuadros (frames) de Plotly: el slider y el botón ▶ que aparecen debajo del
+    # gráfico corren en el navegador, así que cambiar de año no vuelve a ejecutar la app.
+    # "Año fijo" es el modo clásico de un solo año — útil para exportar una imagen estática.
+    modo_comp = st.radio(
+        "🎞 Modo de la comparativa",
+        options=["▶️ Animado (todos los años)", "📌 Año fijo"],
+        horizontal=True
     )
-
-    # Filtramos solo el año seleccionado
-    df_anio = df_f[df_f["anio"] == anio_comp].copy()
+    animado = modo_comp.startswith("▶️")
 
     col7, col8 = st.columns(2)
 
-    with col7:
-        # Barras horizontales: orientation="h" las pone acostadas, más fáciles de leer con nombres largos.
-        # Ordenamos de menor a mayor para que la barra más larga quede arriba (más intuitivo).
-        df_sorted = df_anio.sort_values("facturacion_estimada_millones_usd", ascending=True)
-        fig4a = px.bar(df_sorted, x="facturacion_estimada_millones_usd", y="pais",
-                       orientation="h", color="pais", color_discrete_map=COLORES_PAISES,
-                       title=f"Ranking de facturación en {anio_comp}",
-                       labels={"facturacion_estimada_millones_usd": "USD millones", "pais": "País"},
-                       text="facturacion_estimada_millones_usd")
-        fig4a.update_traces(texttemplate="USD %{text:.0f}M", textposition="outside",
-                            textfont=dict(color="#ddd", size=11))
-        fig4a.update_layout(showlegend=False)
-        fig4a = apply_dark_theme(fig4a, height=380)
-        st.plotly_chart(fig4a, use_container_width=True)
-
-    with col8:
-        # Gráfico de burbujas (scatter con tamaño): permite visualizar 3 dimensiones a la vez.
-        # Eje X = cuánto factura · Eje Y = cuánto produce per cápita · Tamaño = cuántos títulos tiene
-        fig4b = px.scatter(df_anio, x="facturacion_estimada_millones_usd", y="ejemplares_per_capita",
-                           size="titulos_registrados_isbn", color="pais",
-                           color_discrete_map=COLORES_PAISES, text="pais",
-                           title=f"Facturación vs. Per cápita — {anio_comp}",
-                           labels={"facturacion_estimada_millones_usd": "Facturación (USD M)",
-                                    "ejemplares_per_capita": "Ej./habitante"},
-                           size_max=60)
-        fig4b.update_traces(textposition="top center", textfont=dict(color="#ddd", size=11))
-        fig4b.update_layout(showlegend=False)
-        fig4b = apply_dark_theme(fig4b, height=380)
-        st.plotly_chart(fig4b, use_container_width=True)
+    # Año con el que abre la comparativa, en los dos modos.
+    anio_inicial = min(2024, df_f["anio"].max())
+
+    if animado:
+        def preparar_animacion():
+            """Tabla ordenada por año y rangos de ejes fijos para la animación."""
+            # animation_frame="anio" arma un cuadro por año. Plotly toma los cuadros en el orden
+            # en que aparecen en la tabla, por eso ordenamos por año antes de graficar.
+            df_anim = df_f.sort_values(["anio", "pais"])
+
+            # Rangos de ejes FIJOS: si no, cada año tendría su propia escala y las barras y
+            # burbujas "saltarían" aunque el valor no cambie. El 15% extra deja lugar al texto.
+            fact_max   = df_anim["facturacion_estimada_millones_usd"].max()
+            pc_min     = df_anim["ejemplares_per_capita"].min()
+            pc_max     = df_anim["ejemplares_per_capita"].max()
+            margen_pc  = (pc_max - pc_min) * 0.15 or 0.1
+
+            rango_x = [0, fact_max * 1.15]
+            rango_y = [max(0, pc_min - margen_pc), pc_max + margen_pc]
+            return df_anim, rango_x, rango_y
+
+        with col7:
+            def construir_fig4a_animada():
+                df_anim, rango_x, _ = preparar_animacion()
+                fig4a = px.bar(df_anim, x="facturacion_estimada_millones_usd", y="pais",
+                               orientation="h", color="pais", color_discrete_map=COLORES_PAISES,
+                               animation_frame="anio", range_x=rango_x,
+                               title="Ranking de facturación — año a año",
+                               labels={"facturacion_estimada_millones_usd": "USD millones",
+                                       "pais": "País", "anio": "Año"},
+                               text="facturacion_estimada_millones_usd")
+                fig4a.update_traces(texttemplate="USD %{text:.0f}M", textposition="outside",
+                                    textfont=dict(color="#ddd", size=11))
+                fig4a.update_layout(showlegend=False)
+
+                # Cada cuadro lleva en su layout el orden de las barras de SU año, y plotly.js
+                # lo aplica al pasar de un año a otro: así cada cuadro muestra el ranking real.
+                # Plotly dibuja la primera categoría abajo, por eso ordenamos de menor a mayor
+                # (la mayor queda arriba).
+                for cuadro in fig4a.frames:
+                    df_cuadro = df_anim[df_anim["anio"] == int(cuadro.name)]
+                    # Con facturación empatada desempata el nombre, para que el orden sea siempre el mismo.
+                    orden_anio = (df_cuadro.sort_values(["facturacion_estimada_millones_usd", "pais"])["pais"]
+                                  .tolist())
+                    cuadro.layout = {"yaxis": {"categoryorder": "array", "categoryarray": orden_anio}}
+                fig4a.update_yaxes(categoryorder="array",
+                                   categoryarray=fig4a.frames[0].layout.yaxis.categoryarray)
+                fig4a = apply_dark_theme(fig4a, height=460)
+                fig4a.update_layout(margin=dict(t=50, b=130, l=60, r=20))
+                return empezar_animacion_en(fig4a, anio_inicial)
+
+            fig4a = figura_en_cache("fig4a_animada", firma_filtros, construir_fig4a_animada)
+            st.plotly_chart(fig4a, use_container_width=True)
+
+        with col8:
+            # px.scatter calcula el tamaño de las burbujas con el máximo de TODA la tabla
+            # (no de cada año), así una misma cantidad de títulos ocupa siempre el mismo tamaño.
+            def construir_fig4b_animada():
+                df_anim, rango_x, rango_y = preparar_animacion()
+                fig4b = px.scatter(df_anim, x="facturacion_estimada_millones_usd", y="ejemplares_per_capita",
+                                   size="titulos_registrados_isbn", color="pais",
+                                   color_discrete_map=COLORES_PAISES, text="pais",
+                                   animation_frame="anio", animation_group="pais",
+                                   range_x=rango_x, range_y=rango_y,
+                                   title="Facturación vs. Per cápita — año a año",
+                                   labels={"facturacion_estimada_millones_usd": "Facturación (USD M)",
+                                           "ejemplares_per_capita": "Ej./habitante", "anio": "Año"},
+                                   size_max=60)
+                fig4b.update_traces(textposition="top center", textfont=dict(color="#ddd", size=11))
+                fig4b.update_layout(showlegend=False)
+                fig4b = apply_dark_theme(fig4b, height=460)
+                fig4b.update_layout(margin=dict(t=50, b=130, l=60, r=20))
+                return empezar_animacion_en(fig4b, anio_inicial)
+
+            fig4b = figura_en_cache("fig4b_animada", firma_filtros, construir_fig4b_animada)
+            st.plotly_chart(fig4b, use_container_width=True)
+
+    else:
+        # Selector de año independiente del filtro global del sidebar.
+        # select_slider muestra los valores como opciones discretas (cada año disponible).
+        anio_comp = st.select_slider(
+            "📅 Elegí el año para la comparativa",
+            options=sorted(df_f["anio"].unique()),
+            value=anio_inicial
+        )
+
+        # Filtramos solo el año seleccionado
+        df_anio = df_f[df_f["anio"] == anio_comp].copy()
+
+        # El año elegido también forma parte de la firma de estos dos gráficos.
+        firma_anio = f"{firma_filtros}|{anio_comp}"
+
+        with col7:
+            # Barras horizontales: orientation="h" las pone acostadas, más fáciles de leer con nombres largos.
+            # Ordenamos de menor a mayor para que la barra más larga quede arriba (más intuitivo).
+            def construir_fig4a():
+                df_sorted = df_anio.sort_values("facturacion_estimada_millones_usd", ascending=True)
+                fig4a = px.bar(df_sorted, x="facturacion_estimada_millones_usd", y="pais",
+                               orientation="h", color="pais", color_discrete_map=COLORES_PAISES,
+                               title=f"Ranking de facturación en {anio_comp}",
+                               labels={"facturacion_estimada_millones_usd": "USD millones", "pais": "País"},
+                               text="facturacion_estimada_millones_usd")
+                fig4a.update_traces(texttemplate="USD %{text:.0f}M", textposition="outside",
+                                    textfont=dict(color="#ddd", size=11))
+                fig4a.update_layout(showlegend=False)
+                return apply_dark_theme(fig4a, height=380)
+
+            fig4a = figura_en_cache("fig4a", firma_anio, construir_fig4a)
+            st.plotly_chart(fig4a, use_container_width=True)
+
+        with col8:
+            # Gráfico de burbujas (scatter con tamaño): permite visualizar 3 dimensiones a la vez.
+            # Eje X = cuánto factura · Eje Y = cuánto produce per cápita · Tamaño = cuántos títulos tiene
+            def construir_fig4b():
+                fig4b = px.scatter(df_anio, x="facturacion_estimada_millones_usd", y="ejemplares_per_capita",
+                                   size="titulos_registrados_isbn", color="pais",
+                                   color_discrete_map=COLORES_PAISES, text="pais",
+                                   title=f"Facturación vs. Per cápita — {anio_comp}",
+                                   labels={"facturacion_estimada_millones_usd": "Facturación (USD M)",
+                                            "ejemplares_per_capita": "Ej./habitante"},
+                                   size_max=60)
+                fig4b.update_traces(textposition="top center", textfont=dict(color="#ddd", size=11))
+                fig4b.update_layout(showlegend=False)
+                return apply_dark_theme(fig4b, height=380)
+
+            fig4b = figura_en_cache("fig4b", firma_anio, construir_fig4b)
+            st.plotly_chart(fig4b, use_container_width=True)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -537,54 +996,58 @@ with tab3:
     # Selector de país para el gráfico de crisis
     pais_crisis = st.selectbox("🌎 Elegí un país para ver su historia de crisis", options=paises_sel, index=0)
 
-    df_pais   = df_f[df_f["pais"] == pais_crisis].copy()
-    df_crisis = df_pais[df_pais["contexto"].notna() & (df_pais["contexto"].str.strip() != "")]
-
-    # go.Figure() crea un gráfico vacío al que le vamos agregando "trazas" una por una.
-    # Es más flexible que px.line cuando necesitamos dos ejes Y independientes.
-    fig5 = go.Figure()
-
-    # Traza 1: área rellena bajo la línea de ejemplares.
-    # fill="tozeroy" rellena desde la línea hasta el eje X (cero).
-    fig5.add_trace(go.Scatter(
-        x=df_pais["anio"], y=df_pais["ejemplares_producidos_millones"],
-        mode="lines+markers", name="Ejemplares producidos",
-        line=dict(color=COLORES_PAISES.get(pais_crisis, "#f5c842"), width=3),
-        marker=dict(size=7), fill="tozeroy", fillcolor="rgba(245,200,66,0.08)"
-    ))
-
-    # Traza 2: facturación en el eje Y derecho.
-    # yaxis="y2" significa que esta línea usa una escala diferente (eje derecho).
-    # dash="dash" hace que la línea sea punteada para distinguirla visualmente.
-    fig5.add_trace(go.Scatter(
-        x=df_pais["anio"], y=df_pais["facturacion_estimada_millones_usd"],
-        mode="lines", name="Facturación (USD M)",
-        line=dict(color="#ff6b6b", width=2, dash="dash"), yaxis="y2"
-    ))
-
-    # Líneas verticales y anotaciones para cada año con contexto de crisis
-    for _, row in df_crisis.iterrows():
-        fig5.add_vline(x=row["anio"], line_dash="dot",
-                       line_color="rgba(255,107,107,0.5)", line_width=1.5)
-        fig5.add_annotation(
-            x=row["anio"],
-            y=df_pais["ejemplares_producidos_millones"].max() * 0.95,
-            text=f"⚡ {row['contexto']}", showarrow=False,
-            textangle=-90, font=dict(size=9, color="#ff6b6b"), xanchor="right"
+    def construir_fig5():
+        df_pais   = df_f[df_f["pais"] == pais_crisis].copy()
+        df_crisis = df_pais[df_pais["contexto"].notna() & (df_pais["contexto"].str.strip() != "")]
+
+        # go.Figure() crea un gráfico vacío al que le vamos agregando "trazas" una por una.
+        # Es más flexible que px.line cuando necesitamos dos ejes Y independientes.
+        fig5 = go.Figure()
+
+        # Traza 1: área rellena bajo la línea de ejemplares.
+        # fill="tozeroy" rellena desde la línea hasta el eje X (cero).
+        fig5.add_trace(go.Scatter(
+            x=df_pais["anio"], y=df_pais["ejemplares_producidos_millones"],
+            mode="lines+markers", name="Ejemplares producidos",
+            line=dict(color=COLORES_PAISES.get(pais_crisis, "#f5c842"), width=3),
+            marker=dict(size=7), fill="tozeroy", fillcolor="rgba(245,200,66,0.08)"
+        ))
+
+        # Traza 2: facturación en el eje Y derecho.
+        # yaxis="y2" significa que esta línea usa una escala diferente (eje derecho).
+        # dash="dash" hace que la línea sea punteada para distinguirla visualmente.
+        fig5.add_trace(go.Scatter(
+            x=df_pais["anio"], y=df_pais["facturacion_estimada_millones_usd"],
+            mode="lines", name="Facturación (USD M)",
+            line=dict(color="#ff6b6b", width=2, dash="dash"), yaxis="y2"
+        ))
+
+        # Líneas verticales y anotaciones para cada año con contexto de crisis
+        for _, row in df_crisis.iterrows():
+            fig5.add_vline(x=row["anio"], line_dash="dot",
+                           line_color="rgba(255,107,107,0.5)", line_width=1.5)
+            fig5.add_annotation(
+                x=row["anio"],
+                y=df_pais["ejemplares_producidos_millones"].max() * 0.95,
+                text=f"⚡ {row['contexto']}", showarrow=False,
+                textangle=-90, font=dict(size=9, color="#ff6b6b"), xanchor="right"
+            )
+
+        fig5.update_layout(
+            title=f"{pais_crisis} · Producción y facturación con eventos históricos",
+            yaxis=dict(title="Millones de ejemplares"),
+            yaxis2=dict(title="Facturación (USD M)", overlaying="y", side="right", showgrid=False),
+            paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(26,29,39,0.8)",
+            font=dict(family="DM Sans", color="#c0c8d8"),
+            title_font=dict(family="Playfair Display, serif", size=16, color="#f0f0f0"),
+            hovermode="x unified", height=440,
+            margin=dict(t=50, b=80, l=60, r=80),
+            legend=dict(bgcolor="rgba(26,29,39,0.9)", bordercolor="rgba(245,200,66,0.2)",
+                        borderwidth=1, orientation="h", y=-0.2, x=0.5, xanchor="center")
         )
+        return fig5
 
-    fig5.update_layout(
-        title=f"{pais_crisis} · Producción y facturación con eventos históricos",
-        yaxis=dict(title="Millones de ejemplares"),
-        yaxis2=dict(title="Facturación (USD M)", overlaying="y", side="right", showgrid=False),
-        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(26,29,39,0.8)",
-        font=dict(family="DM Sans", color="#c0c8d8"),
-        title_font=dict(family="Playfair Display, serif", size=16, color="#f0f0f0"),
-        hovermode="x unified", height=440,
-        margin=dict(t=50, b=80, l=60, r=80),
-        legend=dict(bgcolor="rgba(26,29,39,0.9)", bordercolor="rgba(245,200,66,0.2)",
-                    borderwidth=1, orientation="h", y=-0.2, x=0.5, xanchor="center")
-    )
+    fig5 = figura_en_cache("fig5", f"{firma_filtros}|{pais_crisis}", construir_fig5)
     st.plotly_chart(fig5, use_container_width=True)
 
     st.markdown("---")
@@ -595,11 +1058,14 @@ with tab3:
         # Tirada promedio: cuántos ejemplares se imprimen de cada título nuevo.
         # Esta cifra cayó dramáticamente en la región: de ~7000 en México en 2000 a ~1500 en Argentina en 2025.
         # Refleja la fragmentación del mercado y el auge de las tiradas cortas (imprimir bajo demanda).
-        fig3a = px.line(df_f, x="anio", y="tirada_promedio_ejemplares", color="pais",
-                        markers=True, title="Tirada promedio por título (ejemplares/título)",
-                        labels={"tirada_promedio_ejemplares": "Ej./título", "anio": "Año", "pais": "País"},
-                        color_discrete_map=COLORES_PAISES)
-        fig3a = apply_dark_theme(fig3a)
+        def construir_fig3a():
+            fig3a = px.line(df_f, x="anio", y="tirada_promedio_ejemplares", color="pais",
+                            markers=True, title="Tirada promedio por título (ejemplares/título)",
+                            labels={"tirada_promedio_ejemplares": "Ej./título", "anio": "Año", "pais": "País"},
+                            color_discrete_map=COLORES_PAISES)
+            return apply_dark_theme(fig3a)
+
+        fig3a = figura_en_cache("fig3a", firma_filtros, construir_fig3a)
         st.plotly_chart(fig3a, use_container_width=True)
 
     with col6:
@@ -608,14 +1074,17 @@ with tab3:
         # .notna() filtra las filas vacías (NaN = "Not a Number" = valor ausente en pandas).
         df_dig = df_f[df_f["formato_digital_pct"].notna()].copy()
         if not df_dig.empty:
-            fig3b = px.line(df_dig, x="anio", y="formato_digital_pct", color="pais",
-                            markers=True, title="Adopción de formato digital (%)",
-                            labels={"formato_digital_pct": "% Digital", "anio": "Año", "pais": "País"},
-                            color_discrete_map=COLORES_PAISES)
-            # La línea en 25% es un umbral de referencia usado en estudios de mercado editorial
-            fig3b.add_hline(y=25, line_dash="dot", line_color="rgba(255,255,255,0.25)",
-                            annotation_text="25% umbral madurez", annotation_font_color="#888")
-            fig3b = apply_dark_theme(fig3b)
+            def construir_fig3b():
+                fig3b = px.line(df_dig, x="anio", y="formato_digital_pct", color="pais",
+                                markers=True, title="Adopción de formato digital (%)",
+                                labels={"formato_digital_pct": "% Digital", "anio": "Año", "pais": "País"},
+                                color_discrete_map=COLORES_PAISES)
+                # La línea en 25% es un umbral de referencia usado en estudios de mercado editorial
+                fig3b.add_hline(y=25, line_dash="dot", line_color="rgba(255,255,255,0.25)",
+                                annotation_text="25% umbral madurez", annotation_font_color="#888")
+                return apply_dark_theme(fig3b)
+
+            fig3b = figura_en_cache("fig3b", firma_filtros, construir_fig3b)
             st.plotly_chart(fig3b, use_container_width=True)
         else:
             st.info("Sin datos de digitalización en el período seleccionado (disponible desde 2012).")
@@ -688,3 +1157,18 @@ st.markdown(
     "⚠️ Los datos de 2025 son estimaciones. Uso educativo."
     "</div>", unsafe_allow_html=True
 )
+
+
+# ── CONTADORES DE LA CACHÉ ────────────────────────────────────────────────────
+# Completamos el lugar reservado en el sidebar. "Aciertos" = resultados que se
+# tomaron de la caché en disco; "fallos" = resultados que hubo que calcular.
+# Los contadores son compartidos por todos los procesos que usan la misma carpeta.
+
+stats_cache = estadisticas_cache()
+if stats_cache is not None:
+    aciertos, fallos, mb_usados = stats_cache
+    contadores_cache.markdown(
+        "<div style='font-size:0.72rem; color:#555; text-align:center; margin-top:0.5rem;'>"
+        f"🗄 Caché en disco: {aciertos:,} aciertos · {fallos:,} fallos · {mb_usados:.1f} MB"
+        "</div>", unsafe_allow_html=True
+    )